@@ -1,13 +1,24 @@
+import asyncio
+import atexit
+import functools
 import os
 import pathlib
-import tempfile
+import re
+import sys
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from getpass import getpass
+from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+import aiofiles
 import chainlit as cl
 import dotenv
+import httpx
 import litellm
 import utils.constants as const
 from assistants.mino.create_assistant import tool_map
@@ -29,54 +40,335 @@ from utils.chat_profile import AppChatProfileType
 from utils.dict_to_object import DictToObject
 
 from utils.llm_profile_builder import build_llm_profile
+from utils.semantic_cache import SemanticCache
 from utils.settings_builder import build_settings
 from utils.url_extractor import extract_url
 
-# Load .env
-dotenv.load_dotenv(dotenv.find_dotenv())
+# Load .env at import so provider keys are available to litellm and to the
+# lazily-built OpenAI clients; interactive prompts run on first chat session
+dotenv.load_dotenv(dotenv.find_dotenv(), override=False)
 
 # Model alias map for litellm
 litellm.model_alias_map = conf.MODEL_ALIAS_MAP
 
-# Load semantic router layer from JSON file
-route_layer = RouteLayer.from_json("./src/router/layers.json")
+# Strip provider-incompatible params instead of raising per call
+litellm.drop_params = True
 
-# Create temporary directory for TTS audio files
-temp_dir = tempfile.TemporaryDirectory()
+# Shared kwargs for every streaming completion call site, built once so
+# litellm's per-call param validation sees an identical dict each time.
+# NOTE: tool use streaming is not supported by most LLM providers (OpenAI,
+# Anthropic), so to use tools the `stream` param must be disabled.
+_ACOMPLETION_DEFAULTS = {
+    "stream": True,
+    "num_retries": 2,
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_route_layer() -> RouteLayer:
+    """
+    Loads the semantic router layer from its JSON file on first use.
+    `from_json` eagerly initializes the embedding encoder, which costs
+    seconds at import and blocks Chainlit's autoreload; loading lazily means
+    sessions with routing disabled never pay for it at all.
+    """
+    return RouteLayer.from_json("./src/router/layers.json")
+
+
+# Strong reference to the router warm-up task; the event loop only holds
+# tasks weakly, so an unreferenced task can be garbage-collected mid warm-up
+_route_layer_warmup_task: Optional[asyncio.Task] = None
+
+
+# Number of TTS audio blobs kept alive per session; bounds memory while the
+# most recent responses stay playable
+TTS_BLOBS_PER_SESSION = 3
+
+# Caps on concurrent outbound provider calls: per-session so one misbehaving
+# client can't fan out dozens of requests, process-wide so the shared httpx
+# pool stays below saturation and providers don't answer with 429 storms.
+_SESSION_OUTBOUND_LIMIT = 4
+_GLOBAL_OUTBOUND_LIMIT = 64
+
+# Created lazily: on Python < 3.10 a semaphore built at import binds the
+# import-time event loop, not the one Chainlit serves requests on
+_global_outbound_sem: Optional[asyncio.Semaphore] = None
+
+
+def _get_global_outbound_sem() -> asyncio.Semaphore:
+    global _global_outbound_sem
+    if _global_outbound_sem is None:
+        _global_outbound_sem = asyncio.Semaphore(_GLOBAL_OUTBOUND_LIMIT)
+    return _global_outbound_sem
 
-# Set LLM Providers API Keys from environment variable or user input
-# OpenAI - API Key
-os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY") or getpass(
-    "Enter OpenAI API Key: "
-)
-# OpenAI - Organization ID - track expense
-# os.environ["OPENAI_ORGANIZATION"] = os.getenv("OPENAI_ORGANIZATION") or getpass(
-#     "(Optional) Enter OpenAI Orginazation ID, for billing management. You can skip this, by pressing the Return key..."
-# )  # OPTIONAL
 
-# os.environ["ASSISTANT_ID"] = os.getenv("ASSISTANT_ID") or getpass(
-#     "(Optional) Enter pre-defined OpenAI Assistant ID, this is used for assistant conversation thread. You can skip this."
-# )  # OPTIONAL
+def _get_session_outbound_sem() -> asyncio.Semaphore:
+    session_sem = cl.user_session.get("outbound_sem")
+    if session_sem is None:
+        session_sem = asyncio.Semaphore(_SESSION_OUTBOUND_LIMIT)
+        cl.user_session.set("outbound_sem", session_sem)
+    return session_sem
 
-os.environ["GEMINI_API_KEY"] = os.getenv("GEMINI_API_KEY") or getpass(
-    "Enter Google Gemini API Key, this is used for Vision capability. You can skip this, by pressing the Return key..."
+
+@asynccontextmanager
+async def _bounded():
+    """
+    Bounds an outbound LLM/audio call with the session and global semaphores.
+    The session slot is taken first so a saturated session queues on its own
+    limit instead of holding a global slot while it waits.
+    """
+    async with _get_session_outbound_sem():
+        async with _get_global_outbound_sem():
+            yield
+
+
+# Process-wide semantic response cache, shared by all sessions
+semantic_cache = SemanticCache()
+
+# Queries shorter than this or matching common conversational fillers skip
+# semantic routing entirely and fall through to the default chat path.
+_ROUTING_MIN_QUERY_LENGTH = 8
+_ROUTING_FILLER_RE = re.compile(
+    r"^(?:yes|no|ok(?:ay)?|sure|thanks?|thank you|please|continue|go on|try again)[.!?]*$",
+    re.IGNORECASE,
 )
 
 
-assistant_id = os.environ.get("ASSISTANT_ID")
+@dataclass
+class _SessionCache:
+    """
+    Per-session snapshot of the chat settings read on hot paths. Going
+    through the session settings dict costs a lookup plus key index per
+    setting, and several handlers read half a dozen settings per turn; one
+    cached object per session turns that into a single lookup.
+    """
+
+    chat_model: str = conf.DEFAULT_MODEL
+    vision_model: str = conf.DEFAULT_VISION_MODEL
+    tts_enabled: bool = conf.SETTINGS_ENABLE_TTS_RESPONSE_DEFAULT_VALUE
+    tts_model: str = conf.DEFAULT_TTS_MODEL
+    tts_voice: str = conf.DEFAULT_TTS_PRESET
+    routing_enabled: bool = conf.SETTINGS_USE_DYNAMIC_CONVERSATION_ROUTING_DEFAULT_VALUE
+    trim_messages: bool = conf.SETTINGS_TRIMMED_MESSAGES_DEFAULT_VALUE
+    semantic_cache: bool = conf.SETTINGS_SEMANTIC_CACHE_DEFAULT_VALUE
+    temperature: float = conf.DEFAULT_TEMPERATURE
+    top_p: float = conf.DEFAULT_TOP_P
+    image_style: str = conf.SETTINGS_IMAGE_GEN_IMAGE_STYLES[0]
+    image_quality: str = conf.SETTINGS_IMAGE_GEN_IMAGE_QUALITIES[0]
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "_SessionCache":
+        return cls(
+            chat_model=settings[conf.SETTINGS_CHAT_MODEL],
+            vision_model=settings[conf.SETTINGS_VISION_MODEL],
+            tts_enabled=settings[conf.SETTINGS_ENABLE_TTS_RESPONSE],
+            tts_model=settings[conf.SETTINGS_TTS_MODEL],
+            tts_voice=settings[conf.SETTINGS_TTS_VOICE_PRESET_MODEL],
+            routing_enabled=settings[conf.SETTINGS_USE_DYNAMIC_CONVERSATION_ROUTING],
+            trim_messages=settings[conf.SETTINGS_TRIMMED_MESSAGES],
+            semantic_cache=settings[conf.SETTINGS_SEMANTIC_CACHE],
+            temperature=settings[conf.SETTINGS_TEMPERATURE],
+            top_p=settings[conf.SETTINGS_TOP_P],
+            image_style=settings[conf.SETTINGS_IMAGE_GEN_IMAGE_STYLE],
+            image_quality=settings[conf.SETTINGS_IMAGE_GEN_IMAGE_QUALITY],
+        )
+
+
+def _get_session_cache() -> _SessionCache:
+    cache = cl.user_session.get("session_cache")
+    if cache is None:
+        cache = _SessionCache()
+        cl.user_session.set("session_cache", cache)
+    return cache
+
+
+# Trimming thresholds: histories shorter than this never trim, and trimming
+# only kicks in once the running token count nears the model's context limit.
+_TRIM_MIN_HISTORY_LENGTH = 6
+_TRIM_TOKEN_BUDGET_RATIO = 0.9
+
+# Assumed context window when litellm has no metadata for the model (e.g.
+# local Ollama aliases); keeps trimming from degenerating into every turn
+_DEFAULT_MAX_TOKENS = 4096
+
+
+@functools.lru_cache(maxsize=64)
+def _get_max_tokens(model: str) -> Optional[int]:
+    try:
+        return litellm.get_max_tokens(model)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _supports_vision(model: str) -> bool:
+    # litellm walks its model metadata dict per call; the answer is static
+    return litellm.supports_vision(model=model)
+
+
+class _CachedRouter:
+    """
+    Memoizes semantic-router classifications. Each routing decision runs an
+    embedding forward pass over the route index, so repeated queries should
+    be O(1) cache hits rather than fresh encoder calls.
+    """
+
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def __classify(normalized_query: str) -> Optional[str]:
+        return _get_route_layer()(normalized_query).name
+
+    def route_name(self, query: str) -> Optional[str]:
+        normalized_query = " ".join(query.lower().split())
+        if (
+            len(normalized_query) < _ROUTING_MIN_QUERY_LENGTH
+            or _ROUTING_FILLER_RE.match(normalized_query)
+        ):
+            return None
+
+        return self.__classify(normalized_query)
+
+
+_cached_router = _CachedRouter()
 
 # List of allowed mime types
 allowed_mime = ["text/csv", "application/pdf"]
 
 
-# Initialize OpenAI client
-openai_client = OpenAI(max_retries=2)
-async_openai_client = AsyncOpenAI(max_retries=2)
+# Shared HTTP connection pools. TTS, Whisper, vision and chat all talk to the
+# same providers, so one tuned pool per process avoids a TLS handshake per
+# request and the default-transport concurrency cliff under parallel sessions.
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=256, max_keepalive_connections=128, keepalive_expiry=30
+)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+http_client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+sync_http_client = httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+
+# litellm reuses the same async pool for its httpx path
+litellm.aclient_session = http_client
+litellm.set_verbose = False
+
+# Set LLM Providers API Keys from environment variable or user input.
+# The OpenAI clients raise at construction when no key is resolvable, so
+# both key prompting and client creation happen in _ensure_api_keys() on the
+# first chat session: import-time getpass blocks container cold starts and
+# Chainlit's autoreload cycles.
+_keys_loaded = False
+_keys_lock = threading.Lock()
+
+assistant_id = os.environ.get("ASSISTANT_ID")
+
+openai_client: Optional[OpenAI] = None
+async_openai_client: Optional[AsyncOpenAI] = None
+
+
+def _ensure_api_keys() -> None:
+    """
+    Resolves provider API keys and builds the OpenAI clients once per
+    process. Runs in a worker thread (getpass would block the event loop).
+    Without a TTY the required OpenAI key raises a clear error instead of
+    hanging on a prompt; the Gemini key stays optional, as the original
+    prompt was skippable by pressing Return.
+    """
+    global _keys_loaded, assistant_id, openai_client, async_openai_client
+
+    with _keys_lock:
+        if _keys_loaded:
+            return
+
+        # OpenAI - API Key (required)
+        if not os.getenv("OPENAI_API_KEY"):
+            if not sys.stdin.isatty():
+                raise RuntimeError(
+                    "OPENAI_API_KEY is not set and there is no TTY to prompt for it. Set it in the environment or .env file."
+                )
+            os.environ["OPENAI_API_KEY"] = getpass("Enter OpenAI API Key: ")
+
+        # Gemini - API Key, this is used for Vision capability (OPTIONAL)
+        if not os.getenv("GEMINI_API_KEY") and sys.stdin.isatty():
+            os.environ["GEMINI_API_KEY"] = getpass(
+                "Enter Google Gemini API Key, this is used for Vision capability. You can skip this, by pressing the Return key..."
+            )
+
+        # OpenAI - Organization ID - track expense (OPTIONAL)
+        # os.environ["OPENAI_ORGANIZATION"]
+
+        # Pre-defined OpenAI Assistant ID, used for assistant conversation thread (OPTIONAL)
+        assistant_id = os.environ.get("ASSISTANT_ID")
+
+        # Initialize OpenAI clients on the shared pools, now that the key exists
+        openai_client = OpenAI(http_client=sync_http_client, max_retries=2)
+        async_openai_client = AsyncOpenAI(http_client=http_client, max_retries=2)
+
+        _keys_loaded = True
+
+
+@atexit.register
+def _close_http_clients() -> None:
+    sync_http_client.close()
+    try:
+        asyncio.run(http_client.aclose())
+    except RuntimeError:
+        # event loop already torn down; connections die with the process
+        pass
 
 
 # constants
 APP_NAME = const.APP_NAME
 
+# System messages are immutable, so build them once instead of per session.
+# History is seeded with a fresh list so sessions never share the same one.
+_CHAT_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a helpful assistant who tries their best to answer questions: ",
+}
+_ASSISTANT_SYSTEM_MESSAGE = {"role": "system", "content": INSTRUCTIONS}
+
+
+class _StreamBuffer:
+    """
+    Coalesces small streamed deltas before flushing them to the Chainlit UI.
+
+    Awaiting `stream_token` for every delta sends one websocket frame per
+    token, so inter-token throughput ends up dominated by framework overhead
+    instead of LLM generation. Batching flushes by size or elapsed time cuts
+    the number of frames by an order of magnitude on long answers. The very
+    first delta is flushed immediately so time-to-first-token is preserved.
+    """
+
+    FLUSH_CHARS = 32
+    FLUSH_INTERVAL = 0.015  # seconds, ~15ms between flushes
+
+    def __init__(self) -> None:
+        self._buf: List[str] = []
+        self._buf_len = 0
+        self._last_flush = 0.0
+        self._flushed_once = False
+
+    def append(self, token: str) -> None:
+        self._buf.append(token)
+        self._buf_len += len(token)
+
+    def should_flush(self, now: float) -> bool:
+        if self._buf_len == 0:
+            return False
+        if not self._flushed_once:
+            return True
+        return (
+            self._buf_len >= self.FLUSH_CHARS
+            or now - self._last_flush > self.FLUSH_INTERVAL
+        )
+
+    def take(self, now: float = 0.0) -> str:
+        chunk = "".join(self._buf)
+        self._buf.clear()
+        self._buf_len = 0
+        self._last_flush = now
+        self._flushed_once = True
+        return chunk
+
 # NOTE: 💡 Check ./TODO file for TODO list
 
 
@@ -91,6 +383,12 @@ async def start_chat():
     Initializes the chat session.
     Builds LLM profiles, configures chat settings, and sets initial system message.
     """
+    # getpass prompts must not block the event loop
+    await asyncio.to_thread(_ensure_api_keys)
+
+    # per-session cap on concurrent outbound provider calls
+    _get_session_outbound_sem()
+
     # Initialize default settings
     cl.user_session.set(
         conf.SETTINGS_CHAT_MODEL, "default_model_name"
@@ -102,6 +400,17 @@ async def start_chat():
     # settings configuration
     settings = await build_settings()
 
+    # warm the router encoder in the background so the first routed message
+    # doesn't pay its cold start; skipped entirely when routing is disabled
+    global _route_layer_warmup_task
+    if (
+        settings[conf.SETTINGS_USE_DYNAMIC_CONVERSATION_ROUTING]
+        and _route_layer_warmup_task is None
+    ):
+        _route_layer_warmup_task = asyncio.create_task(
+            asyncio.to_thread(_get_route_layer)
+        )
+
     # set selected LLM model for current settion's model
     await __config_chat_session(settings)
 
@@ -246,8 +555,12 @@ async def on_message(message: cl.Message) -> None:
         await run(thread_id=thread.id, human_query=message.content, file_ids=files_ids)
 
     else:
-        # Chatbot memory
-        messages = cl.user_session.get("message_history") or []  # Get message history
+        # Chatbot memory. Fetch the history list once; helpers mutate it in
+        # place so appends are never lost to a throwaway fallback list.
+        messages = cl.user_session.get("message_history")
+        if messages is None:
+            messages = [_CHAT_SYSTEM_MESSAGE]
+            cl.user_session.set("message_history", messages)
 
         if len(message.elements) > 0:
             await __handle_files_attachment(
@@ -293,6 +606,11 @@ async def update_settings(settings: Dict[str, Any]) -> None:
     cl.user_session.set(
         conf.SETTINGS_ENABLE_TTS_RESPONSE, settings[conf.SETTINGS_ENABLE_TTS_RESPONSE]
     )
+    cl.user_session.set(
+        conf.SETTINGS_SEMANTIC_CACHE, settings[conf.SETTINGS_SEMANTIC_CACHE]
+    )
+
+    cl.user_session.set("session_cache", _SessionCache.from_settings(settings))
 
 
 @cl.action_callback("speak_chat_response_action")
@@ -308,54 +626,126 @@ async def on_speak_chat_response(action: cl.Action) -> None:
 async def __handle_tts_response(context: str) -> None:
     """
     Generates and sends a TTS audio response using OpenAI's Audio API.
+    Synthesis runs on the async client and audio is collected in memory —
+    the previous shared temp file meant disk I/O per response and concurrent
+    sessions overwriting each other's audio.
     """
-    enable_tts_response = __get_settings(conf.SETTINGS_ENABLE_TTS_RESPONSE)
-    if enable_tts_response is False:
+    cache = _get_session_cache()
+    if cache.tts_enabled is False:
         return
 
     if len(context) == 0:
         return
 
-    model = __get_settings(conf.SETTINGS_TTS_MODEL)
-    voice = __get_settings(conf.SETTINGS_TTS_VOICE_PRESET_MODEL)
+    model = cache.tts_model
+    voice = cache.tts_voice
 
-    with openai_client.audio.speech.with_streaming_response.create(
-        model=model, voice=voice, input=context
-    ) as response:
-        temp_filepath = os.path.join(temp_dir.name, "tts-output.mp3")
-        response.stream_to_file(temp_filepath)
+    buffer = BytesIO()
+    async with _bounded():
+        async with async_openai_client.audio.speech.with_streaming_response.create(
+            model=model, voice=voice, input=context
+        ) as response:
+            async for chunk in response.iter_bytes(chunk_size=4096):
+                buffer.write(chunk)
 
-        await cl.Message(
-            author=model,
-            content="",
-            elements=[
-                cl.Audio(name="", path=temp_filepath, display="inline"),
-                cl.Text(
-                    name="Note",
-                    display="inline",
-                    content=f"You're hearing an AI voice generated by OpenAI's {model} model, using the {voice} style.  You can customize this in Settings if you'd like!",
-                ),
-            ],
-        ).send()
+    audio_bytes = buffer.getvalue()
+
+    # Keep the last few blobs referenced per session so Chainlit can keep
+    # serving them after the message is sent
+    tts_blobs = cl.user_session.get("tts_blobs")
+    if tts_blobs is None:
+        tts_blobs = deque(maxlen=TTS_BLOBS_PER_SESSION)
+        cl.user_session.set("tts_blobs", tts_blobs)
+    tts_blobs.append(audio_bytes)
+
+    await cl.Message(
+        author=model,
+        content="",
+        elements=[
+            cl.Audio(name="", content=audio_bytes, mime="audio/mpeg", display="inline"),
+            cl.Text(
+                name="Note",
+                display="inline",
+                content=f"You're hearing an AI voice generated by OpenAI's {model} model, using the {voice} style.  You can customize this in Settings if you'd like!",
+            ),
+        ],
+    ).send()
 
-        __update_msg_history_from_assistant_with_ctx(context)
+    __update_msg_history_from_assistant_with_ctx(context)
 
 
-def __update_msg_history_from_user_with_ctx(context: str):
-    __update_msg_history_with_ctx(context=context, role="user")
+def __update_msg_history_from_user_with_ctx(
+    context: str, messages: Optional[List[Dict[str, str]]] = None
+):
+    __update_msg_history_with_ctx(context=context, role="user", messages=messages)
 
 
-def __update_msg_history_from_assistant_with_ctx(context: str):
-    __update_msg_history_with_ctx(context=context, role="assistant")
+def __update_msg_history_from_assistant_with_ctx(
+    context: str, messages: Optional[List[Dict[str, str]]] = None
+):
+    __update_msg_history_with_ctx(context=context, role="assistant", messages=messages)
 
 
-def __update_msg_history_with_ctx(context: str, role: str):
-    if len(role) == 0 or len(context) == 0:
+def __update_msg_history_with_ctx(
+    context: str, role: str, messages: Optional[List[Dict[str, str]]] = None
+):
+    """
+    Appends to the session history, mutating the list in place. Callers that
+    already hold the history reference pass it via `messages` to skip the
+    session lookup; otherwise the list stored at session setup is fetched once.
+    """
+    if not role or not context:
         return
 
-    messages = cl.user_session.get("message_history") or []
+    if messages is None:
+        messages = cl.user_session.get("message_history")
+        if messages is None:
+            return
+
     messages.append({"role": role, "content": context})
 
+    # Keep a running token estimate so trimming can stay lazy instead of
+    # re-tokenizing the whole history every turn.
+    model = _get_session_cache().chat_model
+    try:
+        token_count = cl.user_session.get("history_token_count") or 0
+        token_count += litellm.token_counter(model=model, text=context)
+        cl.user_session.set("history_token_count", token_count)
+    except Exception:
+        pass  # unknown tokenizer; trimming falls back to its size heuristic
+
+
+def __should_trim_history(messages: List[Dict[str, str]], model: str) -> bool:
+    """
+    Decides whether `trim_messages` is worth running this turn. Trimming
+    re-walks every prior message, which is O(N^2) across a conversation, so
+    it only runs once the running token count nears the model's limit.
+    """
+    if len(messages) < _TRIM_MIN_HISTORY_LENGTH:
+        return False
+
+    max_tokens = _get_max_tokens(model) or _DEFAULT_MAX_TOKENS
+
+    token_count = cl.user_session.get("history_token_count") or 0
+    return token_count > _TRIM_TOKEN_BUDGET_RATIO * max_tokens
+
+
+def __reset_history_token_count(messages: List[Dict[str, str]], model: str) -> None:
+    """
+    Recomputes the running token estimate from the given history; used after
+    trimming so the threshold reflects what actually survived.
+    """
+    token_count = 0
+    try:
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, str) and content:
+                token_count += litellm.token_counter(model=model, text=content)
+    except Exception:
+        token_count = 0
+
+    cl.user_session.set("history_token_count", token_count)
+
 
 async def __handle_conversation(
     message: cl.Message, messages: List[Dict[str, str]]
@@ -364,13 +754,14 @@ async def __handle_conversation(
     Handles text-based conversations with the user.
     Routes the conversation based on settings and semantic understanding.
     """
-    model = __get_settings(conf.SETTINGS_CHAT_MODEL)  # Get selected LLM model
+    cache = _get_session_cache()
+    model = cache.chat_model  # Get selected LLM model
     msg = cl.Message(content="", author=model)
     await msg.send()
 
     query = message.content  # Get user query
     # Add query to message history
-    __update_msg_history_from_user_with_ctx(query)
+    __update_msg_history_from_user_with_ctx(query, messages=messages)
 
     if _is_currently_in_assistant_profile():
         mino = MinoAssistant(openai_client=async_openai_client)
@@ -379,11 +770,7 @@ async def __handle_conversation(
         await mino.run_assistant()
 
     else:
-        use_dynamic_conversation_routing = __get_settings(
-            conf.SETTINGS_USE_DYNAMIC_CONVERSATION_ROUTING
-        )
-
-        if use_dynamic_conversation_routing:
+        if cache.routing_enabled:
             await __handle_dynamic_conversation_routing_chat(
                 messages, model, msg, query
             )
@@ -397,17 +784,6 @@ def __get_user_session_id() -> str:
     return cl.user_session.get("id") or ""
 
 
-def __get_settings(key: str) -> Any:
-    """
-    Retrieves a specific setting value from the user session.
-    """
-    settings = cl.user_session.get("chat_settings")
-    if settings is None:
-        return
-
-    return settings[key]
-
-
 async def __handle_vision(
     input_image: str,
     prompt: str,
@@ -418,12 +794,10 @@ async def __handle_vision(
     Sends the processed image and description to the user.
     """
     vision_model = (
-        conf.DEFAULT_VISION_MODEL
-        if is_local
-        else __get_settings(conf.SETTINGS_VISION_MODEL)
+        conf.DEFAULT_VISION_MODEL if is_local else _get_session_cache().vision_model
     )
 
-    supports_vision = litellm.supports_vision(model=vision_model)
+    supports_vision = _supports_vision(vision_model)
 
     if supports_vision is False:
         print(f"Unsupported vision model: {vision_model}")
@@ -439,98 +813,159 @@ async def __handle_vision(
         ).send()
         return
 
-    message = cl.Message(
-        content="I'm analyzing the image. This might take a moment.",
-        author=vision_model,
-    )
-
+    message = cl.Message(content="", author=vision_model)
     await message.send()
-    vresponse = await litellm.acompletion(
-        user=__get_user_session_id(),
-        model=vision_model,
-        messages=[
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt},
-                    {"type": "image_url", "image_url": {"url": input_image}},
-                ],
-            }
-        ],
-    )
 
-    description = vresponse.choices[0].message.content
+    # Stream the description so the first tokens appear at the model's
+    # first-token latency rather than after the full generation.
+    async with _bounded():
+        stream = await litellm.acompletion(
+            user=__get_user_session_id(),
+            model=vision_model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt},
+                        {"type": "image_url", "image_url": {"url": input_image}},
+                    ],
+                }
+            ],
+            **_ACOMPLETION_DEFAULTS,
+        )
+
+        description = await __stream_response_to_message(stream, message)
 
     if is_local:
         image = cl.Image(path=input_image, name=prompt, display="inline")
     else:
         image = cl.Image(url=input_image, name=prompt, display="inline")
 
-    message = cl.Message(
-        author=vision_model,
-        content="",
-        elements=[
-            image,
-            cl.Text(name="Explain", content=description, display="inline"),
-        ],
-        actions=[
-            cl.Action(
-                name="speak_chat_response_action",
-                value=description,
-                label="Speak response",
-            )
-        ],
-    )
+    message.elements = [image]
+    message.actions = [
+        cl.Action(
+            name="speak_chat_response_action",
+            value=description,
+            label="Speak response",
+        )
+    ]
 
     __update_msg_history_from_assistant_with_ctx(description)
 
-    await message.send()
+    await message.update()
 
 
 async def __handle_trigger_async_chat(
-    llm_model: str, messages, current_message: cl.Message
+    llm_model: str,
+    messages,
+    current_message: cl.Message,
+    history: Optional[List[Dict[str, str]]] = None,
 ) -> None:
     """
     Triggers an asynchronous chat completion using the specified LLM model.
     Streams the response back to the user and updates the message history.
+
+    `messages` is the payload sent to the model and may be a trimmed copy;
+    `history` is the session history list that appends go to, defaulting to
+    `messages` itself when no separate copy is in play.
     """
+    if history is None:
+        history = messages
 
-    temperature = __get_settings(conf.SETTINGS_TEMPERATURE)
-    top_p = __get_settings(conf.SETTINGS_TOP_P)
-    try:
-        # use LiteLLM for other providers
-        stream = await litellm.acompletion(
-            model=llm_model,
-            messages=messages,
-            stream=True,  # TODO: IMPORTANT: about tool use, note to self tool use streaming is not support for most LLM provider (OpenAI, Anthropic) so in other to use tool, need to disable `streaming` param
-            num_retries=2,
-            temperature=temperature,
-            top_p=top_p,
-        )
+    cache = _get_session_cache()
+    temperature = cache.temperature
+    top_p = cache.top_p
 
-        async for part in stream:
-            if token := part.choices[0].delta.content or "":
-                await current_message.stream_token(token)
+    use_semantic_cache = cache.semantic_cache
+    system_prompt = (
+        messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+    )
+    query = messages[-1]["content"] if messages and messages[-1]["role"] == "user" else ""
+
+    query_vector = None
+    if use_semantic_cache and query:
+        try:
+            # the lookup embeds the query, which is an outbound call too
+            async with _bounded():
+                cached, query_vector = await semantic_cache.lookup(
+                    llm_model, system_prompt, query
+                )
+        except Exception as e:
+            print(f"Semantic cache lookup failed, falling back to LLM. Error: {e}")
+            cached = None
 
-        content = current_message.content
-        __update_msg_history_from_assistant_with_ctx(content)
+        if cached:
+            # replay the cached response in chunks so the UI still streams
+            for start in range(0, len(cached), 64):
+                await current_message.stream_token(cached[start : start + 64])
+            await __finish_assistant_message(current_message, cached, messages=history)
+            return
 
-        enable_tts_response = __get_settings(conf.SETTINGS_ENABLE_TTS_RESPONSE)
-        if enable_tts_response:
-            current_message.actions = [
-                cl.Action(
-                    name="speak_chat_response_action",
-                    value=content,
-                    label="Speak response",
-                )
-            ]
+    try:
+        # use LiteLLM for other providers
+        async with _bounded():
+            stream = await litellm.acompletion(
+                model=llm_model,
+                messages=messages,
+                temperature=temperature,
+                top_p=top_p,
+                **_ACOMPLETION_DEFAULTS,
+            )
+
+            content = await __stream_response_to_message(stream, current_message)
+        if query_vector is not None and content:
+            semantic_cache.store(llm_model, system_prompt, query_vector, content)
 
-        await current_message.update()
+        await __finish_assistant_message(current_message, content, messages=history)
 
     except Exception as e:
         await __handle_exception_error(e)
 
 
+async def __stream_response_to_message(stream, current_message: cl.Message) -> str:
+    """
+    Drains a streaming completion into the Chainlit message using batched
+    flushes and returns the accumulated content.
+    """
+    loop = asyncio.get_running_loop()
+    stream_buffer = _StreamBuffer()
+    async for part in stream:
+        if token := part.choices[0].delta.content or "":
+            stream_buffer.append(token)
+            now = loop.time()
+            if stream_buffer.should_flush(now):
+                await current_message.stream_token(stream_buffer.take(now))
+
+    # flush any tail tokens left in the buffer
+    if remainder := stream_buffer.take():
+        await current_message.stream_token(remainder)
+
+    return current_message.content
+
+
+async def __finish_assistant_message(
+    current_message: cl.Message,
+    content: str,
+    messages: Optional[List[Dict[str, str]]] = None,
+) -> None:
+    """
+    Records the assistant response in history and finalizes the Chainlit
+    message, attaching a TTS action when enabled.
+    """
+    __update_msg_history_from_assistant_with_ctx(content, messages=messages)
+
+    if _get_session_cache().tts_enabled:
+        current_message.actions = [
+            cl.Action(
+                name="speak_chat_response_action",
+                value=content,
+                label="Speak response",
+            )
+        ]
+
+    await current_message.update()
+
+
 async def __handle_exception_error(e: Exception) -> None:
     """
     Handles exceptions that occur during LLM interactions.
@@ -550,26 +985,23 @@ async def __config_chat_session(settings: Dict[str, Any]) -> None:
     Configures the chat session based on user settings and sets the initial system message.
     """
 
+    cl.user_session.set("session_cache", _SessionCache.from_settings(settings))
+
     chat_profile = cl.user_session.get("chat_profile")
     if chat_profile == AppChatProfileType.CHAT.value:
         cl.user_session.set(
             conf.SETTINGS_CHAT_MODEL, settings[conf.SETTINGS_CHAT_MODEL]
         )
 
-        system_message = {
-            "role": "system",
-            "content": "You are a helpful assistant who tries their best to answer questions: ",
-        }
-
-        cl.user_session.set("message_history", [system_message])
+        cl.user_session.set("message_history", [_CHAT_SYSTEM_MESSAGE])
+        cl.user_session.set("history_token_count", 0)
 
         msg = "Hello! I'm here to assist you. Please don't hesitate to ask me anything you'd like to know."
         await cl.Message(content=msg).send()
 
     elif chat_profile == AppChatProfileType.ASSISTANT.value:
-        system_message = {"role": "system", "content": INSTRUCTIONS}
-
-        cl.user_session.set("message_history", [system_message])
+        cl.user_session.set("message_history", [_ASSISTANT_SYSTEM_MESSAGE])
+        cl.user_session.set("history_token_count", 0)
 
         msg = "Hello! I'm Mino, your Assistant. I'm here to assist you. Please don't hesitate to ask me anything you'd like to know. Currently, I can write and run code to answer math questions."
         await cl.Message(content=msg).send()
@@ -589,40 +1021,43 @@ async def __handle_trigger_async_image_gen(query: str) -> None:
     )
     await message.send()
 
-    style = __get_settings(conf.SETTINGS_IMAGE_GEN_IMAGE_STYLE)
-    quality = __get_settings(conf.SETTINGS_IMAGE_GEN_IMAGE_QUALITY)
+    cache = _get_session_cache()
+    style = cache.image_style
+    quality = cache.image_quality
     try:
-        image_response = await litellm.aimage_generation(
-            user=__get_user_session_id(),
-            prompt=query,
-            model=image_gen_model,
-            style=style,
-            quality=quality,
-        )
+        async with _bounded():
+            image_response = await litellm.aimage_generation(
+                user=__get_user_session_id(),
+                prompt=query,
+                model=image_gen_model,
+                style=style,
+                quality=quality,
+            )
 
         image_gen_data = image_response["data"][0]
         image_url = image_gen_data["url"]
         revised_prompt = image_gen_data["revised_prompt"]
 
-        message = cl.Message(
-            author=image_gen_model,
-            content="Here's the image, along with a refined description based on your input:",
-            elements=[
-                cl.Image(url=image_url, name=query, display="inline"),
-                cl.Text(name="Description", content=revised_prompt, display="inline"),
-            ],
-            actions=[
-                cl.Action(
-                    name="speak_chat_response_action",
-                    value=revised_prompt,
-                    label="Speak response",
-                )
-            ],
+        # Update the placeholder in place: one websocket frame instead of a
+        # second full message send, same pattern as the streaming chat path.
+        message.content = (
+            "Here's the image, along with a refined description based on your input:"
         )
+        message.elements = [
+            cl.Image(url=image_url, name=query, display="inline"),
+            cl.Text(name="Description", content=revised_prompt, display="inline"),
+        ]
+        message.actions = [
+            cl.Action(
+                name="speak_chat_response_action",
+                value=revised_prompt,
+                label="Speak response",
+            )
+        ]
 
         __update_msg_history_from_assistant_with_ctx(revised_prompt)
 
-        await message.send()
+        await message.update()
 
     except Exception as e:
         await __handle_exception_error(e)
@@ -641,29 +1076,45 @@ async def __handle_files_attachment(
 
     prompt = message.content
 
+    # Text files mutate message.content, so they are handled serially first.
+    # Vision and transcription calls are independent I/O-bound tasks and run
+    # concurrently instead of paying one round-trip per file.
+    tasks = []
     for file in message.elements:
         path = str(file.path)
         mime_type = file.mime or ""
 
         if "image" in mime_type:
-            await __handle_vision(path, prompt=prompt, is_local=True)
+            tasks.append(__handle_vision(path, prompt=prompt, is_local=True))
 
         elif "text" in mime_type:
-            p = pathlib.Path(path, encoding="utf-8")
-            s = p.read_text(encoding="utf-8")
+            p = pathlib.Path(path)
+            s = await asyncio.to_thread(p.read_text, encoding="utf-8")
             message.content = s
             await __handle_conversation(message, messages)
 
         elif "audio" in mime_type:
-            f = pathlib.Path(path)
-            await __handle_audio_transcribe(path, f)
+            tasks.append(__handle_audio_transcribe(path, mime_type))
 
+    if tasks:
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                await __handle_exception_error(result)
 
-async def __handle_audio_transcribe(path, audio_file):
+
+async def __handle_audio_transcribe(path, mime_type):
     model = conf.DEFAULT_WHISPER_MODEL
-    transcription = await async_openai_client.audio.transcriptions.create(
-        model=model, file=audio_file
-    )
+
+    # Read asynchronously and hand the SDK a named in-memory tuple; passing a
+    # Path would make the SDK read the whole file synchronously on the loop.
+    async with aiofiles.open(path, "rb") as f:
+        audio_data = await f.read()
+
+    async with _bounded():
+        transcription = await async_openai_client.audio.transcriptions.create(
+            model=model, file=(os.path.basename(path), audio_data, mime_type)
+        )
     text = transcription.text
 
     await cl.Message(
@@ -686,12 +1137,21 @@ async def __handle_dynamic_conversation_routing_chat(
     Routes the conversation dynamically based on the semantic understanding of the user's query.
     Handles image generation, vision processing, and default chat interactions.
     """
-    route_choice = route_layer(query)
-    route_choice_name = route_choice.name
-
-    should_trimmed_messages = __get_settings(conf.SETTINGS_TRIMMED_MESSAGES)
-    if should_trimmed_messages:
-        messages = trim_messages(messages, model)
+    # Both the router's embedding forward pass and trim_messages' tokenizer
+    # walk are synchronous CPU work; run them in a worker thread so tokens
+    # streaming to other concurrent sessions are not stalled.
+    route_choice_name = await asyncio.to_thread(_cached_router.route_name, query)
+
+    # trim_messages returns a copy; keep the session list for history appends
+    # and use the trimmed copy only as the completion payload
+    history = messages
+    if _get_session_cache().trim_messages and __should_trim_history(messages, model):
+        trimmed = await asyncio.to_thread(trim_messages, messages, model)
+        # make the trim durable: mutate the session list in place and bring
+        # the running token count back in line with what survived, otherwise
+        # every turn past the threshold would re-trim the same history
+        messages[:] = trimmed
+        __reset_history_token_count(messages, model)
 
     print(
         f"""💡
@@ -709,7 +1169,15 @@ async def __handle_dynamic_conversation_routing_chat(
         await __handle_trigger_async_image_gen(query)
 
     elif route_choice_name == SemanticRouterType.VISION_IMAGE_PROCESSING:
-        urls = extract_url(query)
+        # Skip the regex entirely when no URL can be present; for very long
+        # prompts (pasted logs, documents) run it off the event loop so token
+        # streams from concurrent sessions are not stalled.
+        if "http" not in query and "www." not in query:
+            urls = []
+        elif len(query) > 4096:
+            urls = await asyncio.to_thread(extract_url, query)
+        else:
+            urls = extract_url(query)
         if len(urls) > 0:
             print(
                 f"""💡
@@ -727,7 +1195,10 @@ async def __handle_dynamic_conversation_routing_chat(
                 Processing with async chat..."""
             )
             await __handle_trigger_async_chat(
-                llm_model=model, messages=messages, current_message=msg
+                llm_model=model,
+                messages=messages,
+                current_message=msg,
+                history=history,
             )
     else:
         print(
@@ -736,7 +1207,10 @@ async def __handle_dynamic_conversation_routing_chat(
             Processing with async chat..."""
         )
         await __handle_trigger_async_chat(
-            llm_model=model, messages=messages, current_message=msg
+            llm_model=model,
+            messages=messages,
+            current_message=msg,
+            history=history,
         )
 
 
@@ -797,8 +1271,7 @@ async def __process_thread_message(
                 )
 
                 res_message = message_references[id].content
-                enable_tts_response = __get_settings(conf.SETTINGS_ENABLE_TTS_RESPONSE)
-                if enable_tts_response:
+                if _get_session_cache().tts_enabled:
                     message_references[id].actions = [
                         cl.Action(
                             name="speak_chat_response_action",
@@ -833,8 +1306,7 @@ async def __process_thread_message(
 
                 res_message = message_references[id].content
 
-                enable_tts_response = __get_settings(conf.SETTINGS_ENABLE_TTS_RESPONSE)
-                if enable_tts_response:
+                if _get_session_cache().tts_enabled:
                     message_references[id].actions = [
                         cl.Action(
                             name="speak_chat_response_action",
@@ -14,9 +14,11 @@ SETTINGS_ENABLE_TTS_RESPONSE = "settings_enable_tts_response"
 
 SETTINGS_USE_DYNAMIC_CONVERSATION_ROUTING = "settings_use_dynamic_conversation_routing"
 SETTINGS_TRIMMED_MESSAGES = "settings_trimmed_messages"
+SETTINGS_SEMANTIC_CACHE = "settings_semantic_cache"
 SETTINGS_USE_DYNAMIC_CONVERSATION_ROUTING_DEFAULT_VALUE = True
 SETTINGS_TRIMMED_MESSAGES_DEFAULT_VALUE = True
 SETTINGS_ENABLE_TTS_RESPONSE_DEFAULT_VALUE = True
+SETTINGS_SEMANTIC_CACHE_DEFAULT_VALUE = False
 
 # ref https://platform.openai.com/docs/api-reference/chat
 SETTINGS_TEMPERATURE = "settings_temperature"
@@ -0,0 +1,77 @@
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+import litellm
+import numpy as np
+
+# Embedding model used for cache lookups; small and cheap compared to a chat
+# completion round-trip.
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Minimum cosine similarity between the incoming query and a cached query for
+# the cached response to be reused.
+SIMILARITY_THRESHOLD = 0.95
+
+# Cap per cache key so a long-running process stays bounded.
+MAX_ENTRIES_PER_KEY = 256
+
+
+class SemanticCache:
+    """
+    In-memory semantic cache for chat responses.
+
+    Entries are keyed by `(model, system prompt hash)` so different models and
+    differently-primed sessions never share answers. Lookup embeds the user
+    query, L2-normalizes it, and compares against stored query embeddings with
+    a dot product; a hit bypasses the LLM call entirely.
+    """
+
+    def __init__(self, similarity_threshold: float = SIMILARITY_THRESHOLD) -> None:
+        self._similarity_threshold = similarity_threshold
+        self._entries: Dict[Tuple[str, str], List[Tuple[np.ndarray, str]]] = {}
+
+    @staticmethod
+    def __make_key(model: str, system_prompt: str) -> Tuple[str, str]:
+        prompt_hash = hashlib.sha256((system_prompt or "").encode("utf-8")).hexdigest()
+        return (model, prompt_hash)
+
+    @staticmethod
+    async def __embed(query: str) -> np.ndarray:
+        response = await litellm.aembedding(model=EMBEDDING_MODEL, input=[query])
+        vector = np.asarray(response.data[0]["embedding"], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        return vector
+
+    async def lookup(
+        self, model: str, system_prompt: str, query: str
+    ) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        Returns `(cached response or None, query embedding)`.
+        The embedding is returned so a subsequent `store` on a miss does not
+        have to re-embed the same query.
+        """
+        vector = await self.__embed(query)
+
+        entries = self._entries.get(self.__make_key(model, system_prompt))
+        if not entries:
+            return None, vector
+
+        similarities = np.stack([entry[0] for entry in entries]) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self._similarity_threshold:
+            return entries[best][1], vector
+
+        return None, vector
+
+    def store(
+        self, model: str, system_prompt: str, vector: np.ndarray, content: str
+    ) -> None:
+        """
+        Stores a `(query embedding, response)` pair under the cache key.
+        """
+        entries = self._entries.setdefault(self.__make_key(model, system_prompt), [])
+        entries.append((vector, content))
+        if len(entries) > MAX_ENTRIES_PER_KEY:
+            entries.pop(0)
@@ -1,11 +1,12 @@
 import re
 
+# Regular expression pattern to match URLs, compiled once at import so each
+# call pays only the scan, not a recompile
+_URL_RE = re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+', re.IGNORECASE)
 
-def extract_url(text):
-    # Regular expression pattern to match URLs
-    url_pattern = r'https?://[^\s<>"]+|www\.[^\s<>"]+'
 
+def extract_url(text):
     # Find all URLs in the text
-    urls = re.findall(url_pattern, text)
+    urls = _URL_RE.findall(text)
 
     return urls